@@ -0,0 +1,407 @@
+# Copyright (C) 2015 SUSE Linux GmbH
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301,USA.
+
+
+import hashlib
+import os
+import zipfile
+
+from ddt import data, ddt, unpack
+
+from test_base import SetVersionBaseTest
+from tests.loader import import_set_version
+
+
+sv = import_set_version()
+
+
+@ddt
+class ArchiveDirnameTest(SetVersionBaseTest):
+    """Test version detection via the directory names in archives"""
+
+    def test_index(self):
+        self._write_tarfile("test.tar", ["b-1", "a-2"],
+                            ["b-1/x", "b-1/y/z", "a-2/x", "c"])
+        self.assertEqual(sv._get_archive_index("test.tar"),
+                         ["b-1", "a-2", "c"])
+
+    @data(
+        # the first matching path in the order of the archive is used
+        (["testprog-1.2.3"], ["testprog-1.2.3/src/foo_2x.c"], None,
+         "testprog", "1.2.3"),
+        ([], ["testprog-1.2.3/src/foo_2x.c"], None, "testprog", "2x.c"),
+        (["other-1", "testprog-1.2"], [], None, "testprog", "1.2"),
+        (["other-1"], ["other-1/testprog-1.2/x"], None, "testprog", None),
+        (["testprog"], ["testprog/src/foo-2.0"], None, "testprog", "2.0"),
+        ([], ["testprog-1.2.3/README"], r"^testprog-([\d.]+)$", "", None),
+        ([], ["a/b-2.0/c", "testprog-1.0/x"], r".*-([\d.]+)", "", "2.0"),
+        ([], ["a/b-2.0/c", "testprog-1.0/x"], None, "test.rog", "1.0"),
+        (["src"], ["src/version-3.0.txt"], r".*/version-(.*)\.txt", "",
+         "3.0"),
+        (["src"], ["src/version-3.0.txt"], r"src-(.*)", "", None),
+    )
+    @unpack
+    def test_archive_dirname(self, tar_dirs, tar_files, regex, basename,
+                             expected_version):
+        self._write_tarfile("test.tar", tar_dirs, tar_files)
+        vdetector = sv.VersionDetector(regex, ["test.tar"], basename)
+        self.assertEqual(vdetector._get_version_via_archive_dirname(),
+                         expected_version)
+
+
+@ddt
+class ScanBudgetTest(SetVersionBaseTest):
+    """Test the limits for reading archives"""
+
+    def _detect(self, budget):
+        self._write_tarfile("testprog-big.tar", ["testprog-9.9"],
+                            ["testprog-9.9/%d" % i for i in range(50)])
+        self._write_tarfile("testprog-small.tar", ["testprog-1.0"], [])
+        vdetector = sv.VersionDetector(
+            None, ["testprog-big.tar", "testprog-small.tar"], "testprog",
+            budget=budget)
+        with self.assertLogs(level="WARNING") as logs:
+            version = vdetector._get_version_via_archive_dirname()
+        return version, logs.output
+
+    @data(
+        {"max_members": 10},
+        {"max_bytes": 10 * 512},
+        {"max_time": -1},
+    )
+    def test_archive_limit_skips_archive(self, limits):
+        budget = sv.ScanBudget(**limits)
+        version, logs = self._detect(budget)
+        self.assertEqual(version, None if "max_time" in limits else "1.0")
+        self.assertIn("Skipping archive 'testprog-big.tar'", logs[0])
+
+    def test_total_limit_stops_scanning(self):
+        budget = sv.ScanBudget(total_max_members=10)
+        version, logs = self._detect(budget)
+        self.assertIsNone(version)
+        self.assertEqual(len(logs), 1)
+        self.assertIn("in total", logs[0])
+        self.assertGreater(budget.total_members, 10)
+
+    @data(["--scan-max-members", "10"], ["--archive-max-members", "10"],
+          ["--deadline", "60"])
+    def test_limit_keeps_conversion(self, params):
+        self._write_tarfile("testprog-1.0rc1.tar", ["testprog-1.0rc1"],
+                            ["testprog-1.0rc1/PKG-INFO"])
+        with open("test.spec", "w") as f:
+            f.write("Name: testprog\nVersion: 0\n")
+        self._run_set_version(["--basename", "testprog"] + params)
+        self._check_file_assert_contains("test.spec", "Version: 1.0~xrc1")
+
+    @data({"total_max_members": 1}, {"max_members": 1}, {"deadline": -1})
+    def test_limit_cuts_conversion_short(self, limits):
+        self._write_tarfile("testprog-1.0rc1.tar", ["testprog-1.0rc1"],
+                            ["testprog-1.0rc1/PKG-INFO"])
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertIsNone(sv._version_convert(
+                ["testprog-1.0rc1.tar"], "1.0rc1", sv.ScanBudget(**limits)))
+        self.assertIn("Skipping archive 'testprog-1.0rc1.tar'",
+                      logs.output[0])
+        self.assertIn("Package type detection was cut short",
+                      logs.output[-1])
+
+    def test_no_limit(self):
+        self._write_tarfile("testprog-big.tar", ["testprog-9.9"], [])
+        vdetector = sv.VersionDetector(None, ["testprog-big.tar"], "testprog",
+                                       budget=sv.ScanBudget())
+        self.assertEqual(vdetector._get_version_via_archive_dirname(), "9.9")
+
+    def test_deadline_skips_archives(self):
+        self._write_tarfile("testprog-1.0.tar", ["testprog-9.9"], [])
+        vdetector = sv.VersionDetector(None, ["testprog-1.0.tar"],
+                                       "testprog", budget=sv.ScanBudget(
+                                           deadline=-1))
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertEqual(vdetector.autodetect(), "1.0")
+        self.assertEqual(vdetector.truncated, ["archive dirname"])
+        self.assertIn("archive dirname was cut short", logs.output[0])
+
+    def test_deadline_interrupts_archive(self):
+        self._write_tarfile("testprog-1.0.tar", ["testprog-9.9"], [])
+        budget = sv.ScanBudget(deadline=60)
+        vdetector = sv.VersionDetector(None, ["testprog-1.0.tar"],
+                                       "testprog", budget=budget)
+        # deadline is over while the archive is read
+        budget.deadline = 0
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(vdetector._get_version_via_archive_dirname())
+        self.assertTrue(vdetector._interrupted)
+
+    def test_deadline_not_reached(self):
+        self._write_tarfile("testprog-1.0.tar", ["testprog-9.9"], [])
+        vdetector = sv.VersionDetector(None, ["testprog-1.0.tar"],
+                                       "testprog", budget=sv.ScanBudget(
+                                           deadline=60))
+        self.assertEqual(vdetector.autodetect(), "9.9")
+        self.assertEqual(vdetector.truncated, [])
+
+
+@ddt
+class ArchiveManifestTest(SetVersionBaseTest):
+    """Test the sidecar manifests of archives"""
+
+    def _write_manifest(self, archive, lines, **identity):
+        st = os.stat(archive)
+        identity.setdefault("size", st.st_size)
+        identity.setdefault("mtime", int(st.st_mtime))
+        with open(archive + ".manifest", "w") as f:
+            for key, value in identity.items():
+                f.write("%s: %s\n" % (key, value))
+            f.write("".join("%s\n" % line for line in lines))
+
+    def _write_archive(self):
+        # the manifest is trusted over the archive contents
+        self._write_tarfile("testprog.tar", ["testprog-9.9"], [])
+        return "testprog.tar"
+
+    @data(
+        (["dir: testprog-1.2.3"], {}, "1.2.3"),
+        (["dir: other", "version: 4.5"], {}, "4.5"),
+        (["dir: testprog-1.2.3"], {"size": 1}, "9.9"),
+        (["dir: testprog-1.2.3"], {"mtime": 1}, "9.9"),
+        (["dir: testprog-1.2.3"], {"sha256": "0" * 64}, "9.9"),
+        (["marker: testprog-1.2.3/PKG-INFO"], {}, "9.9"),
+    )
+    @unpack
+    def test_archive_dirname(self, lines, identity, expected_version):
+        archive = self._write_archive()
+        self._write_manifest(archive, lines, **identity)
+        vdetector = sv.VersionDetector(None, [archive], "testprog")
+        self.assertEqual(vdetector._get_version_via_archive_dirname(),
+                         expected_version)
+
+    def test_unreadable_manifest(self):
+        archive = self._write_archive()
+        self._write_manifest(archive, ["dir: testprog-1.2.3"])
+        with open(archive + ".manifest", "ab") as f:
+            f.write(b"marker: \xff\n")
+        self.assertIsNone(sv._get_archive_manifest(archive))
+        self.assertIsNone(sv._version_convert([archive], "1.0"))
+
+    def test_archive_dirname_with_digest(self):
+        archive = self._write_archive()
+        with open(archive, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self._write_manifest(archive, ["dir: testprog-1.2.3"], sha256=digest)
+        vdetector = sv.VersionDetector(None, [archive], "testprog")
+        self.assertEqual(vdetector._get_version_via_archive_dirname(),
+                         "1.2.3")
+        # only the digest listed in the manifest is computed
+        self.assertEqual(list(sv._file_digests(archive, ())), ["sha256"])
+
+    def _write_hashed_manifest(self, archive, lines):
+        with open(archive, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self._write_manifest(archive, lines, sha256=digest)
+
+    def test_deadline_interrupts_digests(self):
+        archive = self._write_archive()
+        self._write_hashed_manifest(archive, ["dir: testprog-1.2.3"])
+        budget = sv.ScanBudget(deadline=60)
+        vdetector = sv.VersionDetector(None, [archive], "testprog",
+                                       budget=budget)
+        budget.deadline = 0
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(vdetector._get_version_via_archive_dirname())
+        self.assertTrue(vdetector._interrupted)
+        # a digest cut short is not cached
+        self.assertEqual(sv._file_digests(archive, ()), {})
+        self.assertEqual(sv._get_archive_manifest(archive)["dir"],
+                         ["testprog-1.2.3"])
+
+    def test_deadline_skips_package_type(self):
+        archive = self._write_archive()
+        self._write_hashed_manifest(archive,
+                                    ["marker: testprog-9.9/PKG-INFO"])
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertIsNone(sv._version_convert(
+                [archive], "1.0rc1", sv.ScanBudget(deadline=-1)))
+        self.assertIn("deadline exceeded", logs.output[0])
+
+    @data(
+        (["marker: testprog-1.2.3/PKG-INFO"], "python"),
+        (["marker: testprog-1.2.3/Cargo.toml", "dir: testprog-1.2.3"],
+         "rust"),
+        (["marker:"], None),
+    )
+    @unpack
+    def test_package_type(self, lines, expected_type):
+        self._write_tarfile("testprog.tar", [], ["testprog-9.9/go.mod"])
+        self._write_manifest("testprog.tar", lines)
+        self.assertEqual(
+            sv.PackageTypeDetector._get_package_type(["testprog.tar"]),
+            expected_type)
+
+
+@ddt
+class ZipCentralDirectoryTest(SetVersionBaseTest):
+    """Test reading the member names of zip files"""
+
+    def _write_zip(self, names, comment=b"", prefix=b""):
+        with open("test.zip", "wb") as f:
+            f.write(prefix)
+            with zipfile.ZipFile(f, "w") as zf:
+                zf.comment = comment
+                for name in names:
+                    zf.writestr(name, "x")
+        with zipfile.ZipFile("test.zip") as zf:
+            return zf.namelist()
+
+    @data(
+        (["test-1.0/", "test-1.0/a", "test-1.0/b"], b"", b""),
+        (["test-1.0/Grüße", "test-1.0/a"], b"", b""),
+        (["test-1.0/a"], b"a comment", b""),
+        (["test-1.0/a"], b"", b"#!/bin/sh\nexit 0\n"),
+        ([], b"", b""),
+    )
+    @unpack
+    def test_names(self, names, comment, prefix):
+        expected = self._write_zip(names, comment, prefix)
+        self.assertEqual(list(sv._iter_zip_names("test.zip")), expected)
+
+    def test_zip64(self):
+        names = ["test-1.0/%d" % i for i in range(0x10001)]
+        expected = self._write_zip(names)
+        self.assertEqual(list(sv._iter_zip_names("test.zip")), expected)
+
+    def test_cp437_names(self):
+        with zipfile.ZipFile("test.zip", "w") as zf:
+            info = zipfile.ZipInfo("test-1.0/x")
+            zf.writestr(info, "x")
+        with open("test.zip", "r+b") as f:
+            data = f.read().replace(b"test-1.0/x", b"test-1.0/\x81")
+            f.seek(0)
+            f.write(data)
+        self.assertEqual(list(sv._iter_zip_names("test.zip")),
+                         ["test-1.0/\xfc"])
+
+    @data(b"", b"no zip file", b"PK\x05\x06")
+    def test_no_zip(self, content):
+        with open("test.zip", "wb") as f:
+            f.write(content)
+        self.assertEqual(sv._get_archive_names("test.zip"), [])
+
+    def test_version_and_package_type(self):
+        self._write_zip(["testprog-1.2.3/", "testprog-1.2.3/PKG-INFO"])
+        vdetector = sv.VersionDetector(None, ["test.zip"], "testprog")
+        self.assertEqual(vdetector._get_version_via_archive_dirname(),
+                         "1.2.3")
+        self.assertEqual(sv.PackageTypeDetector._get_package_type(
+            ["test.zip"]), "python")
+
+
+@ddt
+class ArchivePrefilterTest(SetVersionBaseTest):
+    """Test the selection of archives to read"""
+
+    @data(
+        (["vendor-2.tar", "testprog-1.tar", "v3.zip"], "testprog", None,
+         ["testprog-1.tar", "v3.zip"]),
+        (["v3.zip", "testprog-1.tar"], "testprog", None,
+         ["testprog-1.tar", "v3.zip"]),
+        (["vendor-2.tar", "upstream.tar"], "testprog", r"up.*",
+         ["upstream.tar"]),
+        (["vendor-2.tar", "other-1.tar"], "testprog", None,
+         ["vendor-2.tar", "other-1.tar"]),
+        (["vendor-2.tar", "testprog-1.tar"], "", None,
+         ["vendor-2.tar", "testprog-1.tar"]),
+    )
+    @unpack
+    def test_rank(self, files, basename, regex, expected):
+        self.assertEqual(
+            sv._rank_archive_candidates(files, basename, regex), expected)
+
+    @data((True, "1.0"), (False, "9.9"))
+    @unpack
+    def test_vendor_archive(self, prefilter, expected_version):
+        self._write_tarfile("testprog-1.0.tar", ["testprog-1.0"], [])
+        self._write_tarfile("vendor.tar", ["testprog-9.9"], [])
+        vdetector = sv.VersionDetector(None, ["vendor.tar",
+                                              "testprog-1.0.tar"],
+                                       "testprog", prefilter=prefilter)
+        self.assertEqual(vdetector._get_version_via_archive_dirname(),
+                         expected_version)
+        self.assertEqual("vendor.tar" in sv._archive_names_cache,
+                         not prefilter)
+
+    @data(("enable", "1.0~xrc1"), ("disable", "1.0~rc1"))
+    @unpack
+    def test_vendor_archive_package_type(self, prefilter, expected):
+        sv._archive_names_cache.pop("vendor.tar", None)
+        self._write_tarfile("testprog-1.0rc1.tar", ["testprog-1.0rc1"],
+                            ["testprog-1.0rc1/PKG-INFO"])
+        self._write_tarfile("vendor.tar", [], ["vendor/vendor.gemspec"])
+        args = {"basename": "testprog", "regex": None,
+                "archive_prefilter": prefilter}
+        self.assertEqual(sv._version_convert(
+            ["vendor.tar", "testprog-1.0rc1.tar"], "1.0rc1", args=args),
+            expected)
+        self.assertEqual("vendor.tar" in sv._archive_names_cache,
+                         prefilter == "disable")
+
+    def test_negative_cache(self):
+        self._write_tarfile("testprog.tar", ["src"], [])
+        vdetector = sv.VersionDetector(None, ["testprog.tar"], "testprog")
+        self.assertIsNone(vdetector._get_version_via_archive_dirname())
+        with self.assertLogs(level="DEBUG") as logs:
+            self.assertIsNone(vdetector._get_version_via_archive_dirname())
+        self.assertIn("did not match before", "\n".join(logs.output))
+        # a changed archive is read again
+        self._write_tarfile("testprog.tar", ["testprog-2.0"], [])
+        self.assertEqual(vdetector._get_version_via_archive_dirname(), "2.0")
+
+
+@ddt
+class VersionSelectionTest(SetVersionBaseTest):
+    """Test selecting the highest of several detected versions"""
+
+    def setUp(self):
+        super(VersionSelectionTest, self).setUp()
+        self._write_tarfile("testprog-1.10.tar", ["testprog-1.10"], [])
+        self._write_tarfile("testprog-1.9.tar", ["testprog-1.9"], [])
+        with open("testprog.obsinfo", "w") as f:
+            f.write("name: testprog\nversion: 1.10~rc1\n")
+        # newest first, as returned by _get_local_files()
+        self.files = ["testprog-1.9.tar", "testprog.obsinfo",
+                      "testprog-1.10.tar"]
+
+    @data(("first", "1.10~rc1"), ("rpm", "1.10"))
+    @unpack
+    def test_select(self, select, expected_version):
+        vdetector = sv.VersionDetector(None, self.files, "testprog",
+                                       select=select)
+        self.assertEqual(vdetector.autodetect(), expected_version)
+
+    def test_versionfile_first(self):
+        with open("VERSION", "w") as f:
+            f.write("Version: 0.1\n")
+        vdetector = sv.VersionDetector(None, self.files, "testprog",
+                                       "VERSION", select="rpm")
+        self.assertEqual(vdetector.autodetect(), "0.1")
+
+    def test_invalidate(self):
+        vdetector = sv.VersionDetector(None, self.files, "testprog",
+                                       select="rpm")
+        self.assertEqual(vdetector.autodetect(), "1.10")
+        self._write_tarfile("testprog-2.0.tar", ["testprog-2.0"], [])
+        vdetector.invalidate(["testprog-2.0.tar"],
+                             ["testprog-2.0.tar"] + self.files)
+        self.assertEqual(vdetector.autodetect(), "2.0")
@@ -19,9 +19,13 @@ import subprocess
 import unittest
 
 
-from ddt import ddt, file_data
+from ddt import data, ddt, file_data, unpack
 
 from test_base import SetVersionBaseTest
+from tests.loader import import_set_version
+
+
+sv = import_set_version()
 
 
 def has_dch_executable():
@@ -95,3 +99,26 @@ class SetVersionDebianChangelog(SetVersionBaseTest):
         self._run_set_version(["--basename", "testprog"])
         self._check_file_assert_contains(dchlog_path, expected_version)
         self._check_file_assert_not_contains(dchlog_path, old_version)
+
+
+@ddt
+class DebianCheckOrderingTest(SetVersionBaseTest):
+    """Test --check-ordering for .dsc files and debian changelogs"""
+
+    @data(
+        ("1.0-1", "1.0", True),
+        ("1.0-1", "1.1", True),
+        ("1.0-1", "1.0~rc1", False),
+        ("1.0", "1.0", True),
+        ("1.0", "0.9", False),
+    )
+    @unpack
+    def test_check_ordering(self, old_version, new_version, ok):
+        with open("test.dsc", "w") as f:
+            f.write("Source: foobar\nVersion: %s\n" % old_version)
+        with open("debian.changelog", "w") as f:
+            f.write("foobar (%s) unstable; urgency=low\n" % old_version)
+        failed = sv._check_version_ordering(
+            ["test.dsc", "debian.changelog"], new_version, None)
+        self.assertEqual([f for f, _, _ in failed],
+                         [] if ok else ["test.dsc", "debian.changelog"])
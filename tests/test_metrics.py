@@ -0,0 +1,73 @@
+# Copyright (C) 2015 SUSE Linux GmbH
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301,USA.
+
+
+import os
+import subprocess
+import sys
+
+from test_base import SET_VERSION_EXECUTABLE, SetVersionBaseTest
+from tests.loader import import_set_version
+
+
+sv = import_set_version()
+
+
+class MetricsTest(SetVersionBaseTest):
+    """Test the Prometheus textfile metrics"""
+
+    def _read_samples(self, filename):
+        samples = {}
+        with open(filename) as f:
+            for line in f:
+                if not line.startswith("#"):
+                    sample, value = line.rsplit(" ", 1)
+                    samples[sample] = float(value)
+        return samples
+
+    def test_write_adds_to_totals(self):
+        for _ in range(2):
+            m = sv.Metrics()
+            m.inc("set_version_cache_hits_total", cache="digests")
+            m.observe("set_version_rewrite_seconds", 0.02, type="spec")
+            m.write("metrics.prom")
+        samples = self._read_samples("metrics.prom")
+        self.assertEqual(
+            samples['set_version_cache_hits_total{cache="digests"}'], 2)
+        self.assertEqual(samples['set_version_rewrite_seconds_bucket'
+                                 '{le="0.01",type="spec"}'], 0)
+        self.assertEqual(samples['set_version_rewrite_seconds_bucket'
+                                 '{le="0.05",type="spec"}'], 2)
+        self.assertEqual(samples['set_version_rewrite_seconds_count'
+                                 '{type="spec"}'], 2)
+        with open("metrics.prom") as f:
+            self.assertIn("# TYPE set_version_rewrite_seconds histogram\n",
+                          f.read())
+
+    def test_concurrent_runs(self):
+        self._write_tarfile("testprog-1.0.tar", ["testprog-1.0"], [])
+        metrics_file = os.path.join(self._tmpdir, "metrics.prom")
+        procs = [subprocess.Popen(
+            [sys.executable, SET_VERSION_EXECUTABLE, "--outdir", self._tmpdir,
+             "--metrics-file", metrics_file]) for _ in range(5)]
+        for p in procs:
+            self.assertEqual(p.wait(), 0)
+        samples = self._read_samples(metrics_file)
+        self.assertEqual(samples["set_version_runs_total"], 5)
+        self.assertEqual(samples['set_version_strategy_hits_total'
+                                 '{strategy="archive dirname"}'], 5)
+        self.assertEqual(samples['set_version_archives_opened_total'
+                                 '{format="tar"}'], 5)
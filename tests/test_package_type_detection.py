@@ -30,7 +30,17 @@ class PackageTypeDetector(SetVersionBaseTest):
         ("test.tar", [], ["test.egg-info/PKG-INFO"], "python"),
         ("test.tar", [], ["test-1.2.3a1/test.egg-info/PKG-INFO"], "python"),
         ("test.tar", [], ["PKG-INFO"], None),
-        ("test.tar", [], ["foo.py"], None)
+        ("test.tar", [], ["test-1.2.3/PKG-INFO"], "python"),
+        ("test.tar", [], ["./test-1.2.3/PKG-INFO"], "python"),
+        ("test.tar", [], ["foo.py"], None),
+        ("test.tar", [], ["test-1.2.3/Cargo.toml"], "rust"),
+        ("test.tar", [], ["test-1.2.3/Cargo.toml", "test-1.2.3/PKG-INFO"],
+         "python"),
+        ("test.tar", [], ["test-1.2.3/go.mod"], "golang"),
+        ("test.tar", [], ["test-1.2.3/test.gemspec"], "ruby"),
+        ("test.tar", [], ["package/package.json"], "nodejs"),
+        ("test.tar", [], ["test-1.2.3/node_modules/foo/package.json"], None),
+        ("test.tar", [], ["test-1.2.3/vendor/foo/Cargo.toml"], None),
     )
     @unpack
     def test_detection(self, tar_name, tar_dirs, tar_files, expected_result):
@@ -38,3 +48,24 @@ class PackageTypeDetector(SetVersionBaseTest):
         files = sv._get_local_files()
         pack_type = sv.PackageTypeDetector._get_package_type(files)
         self.assertEqual(expected_result, pack_type)
+
+    @data(
+        ("rust", "1.2.3", "1.2.3"),
+        ("rust", "1.2.3-alpha.1", "1.2.3~alpha.1"),
+        ("rust", "1.2.3-rc-1+build.5", "1.2.3~rc.1+build.5"),
+        ("nodejs", "1.0.0-beta", "1.0.0~beta"),
+        ("golang", "v1.2.3", "1.2.3"),
+        ("golang", "v0.0.0-20191109021931-daa7c04131f5",
+         "0.0.0~20191109021931.daa7c04131f5"),
+        ("golang", "v2.0.0+incompatible", "2.0.0+incompatible"),
+        ("rust", "1.2", None),
+        ("ruby", "1.2.3", "1.2.3"),
+        ("ruby", "1.2.3.rc1", "1.2.3~rc1"),
+        ("ruby", "1.2.3.pre.2", "1.2.3~pre.2"),
+        ("ruby", "1.2.3~rc1", None),
+    )
+    @unpack
+    def test_version_conversion(self, package_type, version,
+                                expected_version):
+        converter = sv._version_converters[package_type]
+        self.assertEqual(converter(version), expected_version)
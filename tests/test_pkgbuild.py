@@ -15,11 +15,16 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301,USA.
 
 
+import hashlib
 import os
 
 from ddt import ddt, file_data
 
 from test_base import SetVersionBaseTest
+from tests.loader import import_set_version
+
+
+sv = import_set_version()
 
 
 @ddt
@@ -53,3 +58,44 @@ class SetVersionPKGBUILD(SetVersionBaseTest):
         self._check_file_assert_contains(pkgbuild_path, expected_str)
         expected_str = "sha256sums=('SKIP')"
         self._check_file_assert_contains(pkgbuild_path, expected_str)
+
+    def test_checksums(self):
+        with open("testprog-1.2.3.tar.gz", "wb") as f:
+            f.write(b"testprog")
+        with open("fix.patch", "wb") as f:
+            f.write(b"")
+        pkgbuild_path = self._write_pkgbuild_file(
+            "PKGBUILD", {"pkgname": "testprog", "pkgver": "1.0"},
+            custom=['source=("$pkgname-${pkgver}.tar.gz"',
+                    '        "https://example.com/other.patch"',
+                    '        # comment',
+                    '        fix.patch)',
+                    "md5sums=('fail'", "         'fail'", "         'fail')",
+                    "b2sums=('fail')"])
+        self._run_set_version(params=['--version', '1.2.3'])
+        self._check_file_assert_contains(
+            pkgbuild_path,
+            "md5sums=('%s' 'SKIP' '%s')\n" % (
+                hashlib.md5(b"testprog").hexdigest(),
+                hashlib.md5(b"").hexdigest()))
+        self._check_file_assert_contains(
+            pkgbuild_path,
+            "b2sums=('%s' 'SKIP' '%s')\n" % (
+                hashlib.blake2b(b"testprog").hexdigest(),
+                hashlib.blake2b(b"").hexdigest()))
+        self._check_file_assert_not_contains(pkgbuild_path, "fail")
+        self._check_file_assert_not_contains(pkgbuild_path, "sha256sums")
+
+    def test_checksums_only_present_digests(self):
+        with open("testprog-1.2.3.tar.gz", "wb") as f:
+            f.write(b"only md5")
+        pkgbuild_path = self._write_pkgbuild_file(
+            "PKGBUILD", {"pkgname": "testprog", "pkgver": "1.0"},
+            custom=['source=("$pkgname-${pkgver}.tar.gz")',
+                    "md5sums=('fail')"])
+        checksums = sv._get_pkgbuild_checksums(pkgbuild_path, "1.2.3")
+        self.assertEqual(checksums, {"md5sums": "('%s')" % hashlib.md5(
+            b"only md5").hexdigest()})
+        st = os.stat("testprog-1.2.3.tar.gz")
+        key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        self.assertEqual(list(sv._digest_cache[key]), ["md5"])
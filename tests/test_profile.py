@@ -0,0 +1,85 @@
+# Copyright (C) 2015 SUSE Linux GmbH
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301,USA.
+
+
+import glob
+import os
+import pstats
+import re
+import subprocess
+import sys
+
+from test_base import SET_VERSION_EXECUTABLE, SetVersionBaseTest
+from tests.loader import import_set_version
+
+
+sv = import_set_version()
+
+
+class ProfilerTest(SetVersionBaseTest):
+    """Test the profiling hooks"""
+
+    def setUp(self):
+        super(ProfilerTest, self).setUp()
+        self.profiler = sv.Profiler()
+
+    def test_disabled(self):
+        calls = []
+
+        @self.profiler.profiled()
+        def _func(x):
+            calls.append(x)
+            return x
+
+        self.assertEqual(_func(1), 1)
+        self.assertEqual(calls, [1])
+        self.assertEqual(os.listdir("."), [])
+
+    def test_nested(self):
+        self.profiler.directory = "prof"
+
+        @self.profiler.profiled(lambda x: "inner-%d" % x)
+        def _inner(x):
+            return [x] * 1000
+
+        @self.profiler.profiled()
+        def _outer():
+            return _inner(1) + _inner(2)
+
+        self.assertEqual(len(_outer()), 2000)
+        self.assertEqual(len(_inner(3)), 1000)
+        # the nested calls are part of the report of the outer call
+        reports = sorted(re.sub(r"-\d+-\d+\.", ".", f)
+                         for f in os.listdir("prof"))
+        self.assertEqual(reports, ["inner-3.alloc", "inner-3.pstats",
+                                   "outer.alloc", "outer.pstats"])
+        stats = pstats.Stats(glob.glob("prof/outer-*.pstats")[0])
+        self.assertIn("_inner", [func[2] for func in stats.stats])
+        with open(glob.glob("prof/inner-3-*.alloc")[0]) as f:
+            self.assertTrue(f.readline().startswith("# inner-3: "))
+
+    def test_run(self):
+        self._write_tarfile("testprog-1.0.tar", ["testprog-1.0"], [])
+        with open("test.spec", "w") as f:
+            f.write("Name: testprog\nVersion: 0\n")
+        os.mkdir("out")
+        env = dict(os.environ, SET_VERSION_PROFILE_DIR="prof")
+        subprocess.check_call(
+            [sys.executable, SET_VERSION_EXECUTABLE, "--outdir", "out",
+             "--basename", "testprog"], env=env)
+        reports = set(f.split("-", 1)[0] for f in os.listdir("prof"))
+        self.assertEqual(reports, set(["autodetect", "package_type",
+                                       "replace_define", "replace_tag"]))
@@ -106,6 +106,38 @@ class DpkgVersionCompare(VersionCompareBase):
         return self.__do_compare(other, 'ge')
 
 
+class NativeVersionCompare(VersionCompareBase):
+    """ class to compare version strings with set_version's own
+    implementation of rpm's and dpkg's version ordering"""
+    compare = None
+
+    def _do_compare(self, other):
+        return type(self).compare(self.version_str, other.version_str)
+
+    def __lt__(self, other):
+        return self._do_compare(other) < 0
+
+    def __le__(self, other):
+        return self._do_compare(other) <= 0
+
+    def __eq__(self, other):
+        return self._do_compare(other) == 0
+
+    def __gt__(self, other):
+        return self._do_compare(other) > 0
+
+    def __ge__(self, other):
+        return self._do_compare(other) >= 0
+
+
+class RpmVersionCompare(NativeVersionCompare):
+    compare = staticmethod(sv.rpm_version_compare)
+
+
+class DebianVersionCompare(NativeVersionCompare):
+    compare = staticmethod(sv.debian_version_compare)
+
+
 @ddt
 class VersionConverterTest(SetVersionBaseTest):
     @data(
@@ -129,30 +161,23 @@ class VersionConverterTest(SetVersionBaseTest):
 
 
 @ddt
-@unittest.skipIf(HAS_ZYPPER is False and HAS_DPKG is False,
-                 "zypper and dpkg are both unavailable")
 class VersionCompareTests(SetVersionBaseTest):
     def _do_version_compare(self, v1, op, v2):
-        """ make sure that a version compare with pip and
-        zypper leads to the same result"""
+        """ make sure that a version compare with pip, rpm and
+        dpkg leads to the same result"""
         # parse pip versions
         v1_pip = parse(v1)
         v2_pip = parse(v2)
         # generate rpm version strings
         v1_rpm = sv._version_python_pip2rpm(v1)
         v2_rpm = sv._version_python_pip2rpm(v2)
-        checked_package_managers = [('pip', v1_pip, v2_pip)]
-        # generate Zypper objects to be able to compare the strings
-        if HAS_ZYPPER:
-            v1_zypp = ZypperVersionCompare(v1_rpm)
-            v2_zypp = ZypperVersionCompare(v2_rpm)
-            checked_package_managers.append(('zypper', v1_zypp, v2_zypp))
-        # generate dpkg objects to be able to compare the strings
-        if HAS_DPKG:
-            v1_dpkg = DpkgVersionCompare(v1_rpm)
-            v2_dpkg = DpkgVersionCompare(v2_rpm)
-            checked_package_managers.append(('dpkg', v1_dpkg, v2_dpkg))
-        # compare version strings for pip, zypper and dpkg
+        checked_package_managers = [
+            ('pip', v1_pip, v2_pip),
+            ('rpm', RpmVersionCompare(v1_rpm), RpmVersionCompare(v2_rpm)),
+            ('dpkg', DebianVersionCompare(v1_rpm),
+             DebianVersionCompare(v2_rpm)),
+        ]
+        # compare version strings for pip, rpm and dpkg
         for type_, vv1, vv2 in checked_package_managers:
             if op == '==':
                 self.assertEqual(vv1, vv2,
@@ -281,3 +306,72 @@ class VersionCompareTests(SetVersionBaseTest):
         """ version order should be same between pip and zypper"""
         for i, _ in enumerate(version_chain[:-1]):
             self._do_version_compare(version_chain[i], op, version_chain[i+1])
+
+
+@ddt
+class NativeVersionCompareTests(SetVersionBaseTest):
+    @data(
+        ('1.0', '1.0', 0), ('1.0', '2.0', -1), ('2.0.1a', '2.0.1', 1),
+        ('5.5p10', '5.5p1', 1), ('xyz.4', '8', -1), ('10.0001', '10.1', 0),
+        ('2.0', '2_0', 0), ('+', '_', 0), ('6.0.rc1', '6.0', 1),
+        ('1.0~rc1', '1.0', -1), ('1.0~rc1~git123', '1.0~rc1', -1),
+        ('1.0^', '1.0', 1), ('1.0^git1', '1.01', -1),
+        ('1.0^20160101', '1.0.1', -1), ('1.0~rc1^git1', '1.0~rc1', 1),
+        ('1.0^git1~pre', '1.0^git1', -1),
+    )
+    @unpack
+    def test_rpmvercmp(self, v1, v2, expected):
+        self.assertEqual(sv.rpmvercmp(v1, v2), expected)
+        self.assertEqual(sv.rpmvercmp(v2, v1), -expected)
+        key1, key2 = sv._rpmvercmp_key(v1), sv._rpmvercmp_key(v2)
+        self.assertEqual((key1 > key2) - (key1 < key2), expected)
+
+    @data(
+        ('1:1.0-1', '2.0-1', 1), ('1.0-1', '1.0', 1), ('1.0-0', '1.0', 0),
+        ('1.0~rc1-1', '1.0-1', -1), ('1.0-1~bpo1', '1.0-1', -1),
+        ('1.0a', '1.0+', -1), ('1.0.1', '1.0a', 1), ('1-2-3', '1-2', 1),
+    )
+    @unpack
+    def test_debian_version_compare(self, v1, v2, expected):
+        self.assertEqual(sv.debian_version_compare(v1, v2), expected)
+        self.assertEqual(sv.debian_version_compare(v2, v1), -expected)
+
+    @data(
+        ('1.0', '1.0', 0), ('1.0~rc1', '1.0', -1), ('1:0.9', '1.0', 1),
+        ('1.0-2', '1.0-10', -1), ('1.0', '1.0-10', 0),
+    )
+    @unpack
+    def test_rpm_version_compare(self, v1, v2, expected):
+        self.assertEqual(sv.rpm_version_compare(v1, v2), expected)
+
+    @data(
+        (["1.0", "1:0.9", "1.10"], "rpm", "1:0.9"),
+        (["1.0-2", "1.0-10", "1.0"], "rpm", "1.0-10"),
+        (["1.0~rc1", "1.0", "1.0^git1"], "rpm", "1.0^git1"),
+        (["1.10rc1", "1.9", "1.10.dev1"], "pep440", "1.10rc1"),
+        (["1.0.post1", "1.0", "1.0+local"], "pep440", "1.0.post1"),
+        (["master", "1.0"], "pep440", "1.0"),
+        ([], "rpm", None),
+    )
+    @unpack
+    def test_highest_version(self, versions, ordering, expected):
+        self.assertEqual(sv._highest_version(versions, ordering), expected)
+
+    @data('1.0', '1.0~rc1', '1.0.a', '1.0+git1', '2:1.0~dev3', '10.0001')
+    @unittest.skipUnless(HAS_ZYPPER, "zypper is unavailable")
+    def test_same_as_zypper(self, v1):
+        for v2 in ('1.0', '1.0~rc1', '1:0.1', '1.0.0', '1.0a'):
+            self.assertEqual(
+                ZypperVersionCompare(v1)._do_compare(
+                    ZypperVersionCompare(v2)) > 0,
+                sv.rpm_version_compare(v1, v2) > 0)
+
+    @data('1.0', '1.0~rc1', '1.0.a', '1.0+git1', '2:1.0~dev3', '1.0-1~bpo1')
+    @unittest.skipUnless(HAS_DPKG, "dpkg is unavailable")
+    def test_same_as_dpkg(self, v1):
+        for v2 in ('1.0', '1.0~rc1', '1:0.1', '1.0.0', '1.0a', '1.0-1'):
+            for op, cmp in (('lt', -1), ('eq', 0), ('gt', 1)):
+                self.assertEqual(
+                    DpkgVersionCompare(v1)._DpkgVersionCompare__do_compare(
+                        DpkgVersionCompare(v2), op),
+                    sv.debian_version_compare(v1, v2) == cmp)
@@ -15,6 +15,7 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301,USA.
 
 
+import json
 import os
 import shutil
 from ddt import data, ddt, file_data, unpack
@@ -272,3 +273,53 @@ class SetVersionSpecfile(SetVersionBaseTest):
         shutil.copyfile(fn, nfn)
         sv._replace_spec_setup(nfn, '0.0.1')
         os.unlink(nfn)
+
+    @data(
+        ("1.2.3", "1.2.4", True),
+        ("1.2.3", "1.2.3", True),
+        ("1.2.3", "1.2.3~rc1", False),
+        ("1.2.3", "1.10", True),
+        ("%{pkg_version}", "0.1", True),
+    )
+    @unpack
+    def test_check_ordering(self, old_version, new_version, ok):
+        spec_path = self._write_specfile("test.spec", {"Version": old_version})
+        params = ["--version", new_version, "--check-ordering", "enable"]
+        if ok:
+            self._run_set_version(params)
+            self._check_file_assert_contains(spec_path,
+                                             "Version: %s" % new_version)
+        else:
+            self.assertRaisesRegex(Exception, "ordering check failed",
+                                   self._run_set_version, params)
+            self._check_file_assert_contains(spec_path,
+                                             "Version: %s" % old_version)
+
+    def test_check_ordering_disable(self):
+        spec_path = self._write_specfile("test.spec", {"Version": "1.2.3"})
+        self._run_set_version(["--version", "1.0", "--check-ordering",
+                               "disable"])
+        self._check_file_assert_contains(spec_path, "Version: 1.0")
+
+    def test_queries(self):
+        main_path = self._write_specfile("main.spec", {"Version": "0"})
+        docs_path = self._write_specfile("docs.spec", {"Version": "0"})
+        self._write_tarfile("testprog-1.2.3.tar", [], [])
+        self._write_tarfile("testprog-docs-4.5.tar", [], [])
+        self._run_set_version([
+            "--query", json.dumps({"basename": "testprog",
+                                   "regex": r"^testprog-([\d.]+)\.tar$",
+                                   "file": "main.spec"}),
+            "--query", json.dumps({"basename": "testprog-docs",
+                                   "file": ["docs.spec"]})])
+        self._check_file_assert_contains(main_path, "Version: 1.2.3")
+        self._check_file_assert_contains(docs_path, "Version: 4.5")
+
+    def test_queries_conflict(self):
+        spec_path = self._write_specfile("main.spec", {"Version": "0"})
+        self.assertRaisesRegex(
+            Exception, "conflicting versions detected for main.spec",
+            self._run_set_version, [
+                "--query", json.dumps({"version": "1.0"}),
+                "--query", json.dumps({"version": "2.0"})])
+        self._check_file_assert_contains(spec_path, "Version: 0")
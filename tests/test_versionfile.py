@@ -0,0 +1,132 @@
+# Copyright (C) 2015 SUSE Linux GmbH
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301,USA.
+
+
+import os
+import tarfile
+import zipfile
+
+from ddt import data, ddt, unpack
+
+from test_base import SetVersionBaseTest
+from tests.loader import import_set_version
+
+
+sv = import_set_version()
+
+
+@ddt
+class VersionFileTest(SetVersionBaseTest):
+    """Test version detection via --fromfile"""
+
+    def _detect(self, content, regex=None):
+        with open("VERSION", "wb") as f:
+            f.write(content.encode('utf8'))
+        vdetector = sv.VersionDetector(regex, [], '', "VERSION")
+        return vdetector._get_version_via_versionfile()
+
+    @data(
+        ("Version: 1.2.3\n", None, "1.2.3"),
+        ("foo\nbar\nVersion: 1.2.3\nVersion: 4.5.6\n", None, "1.2.3"),
+        ("Version: 1.2.3", None, "1.2.3"),
+        ("Version: 1.2.3\r\n", None, "1.2.3\r"),
+        ("Version:\n1.2.3\n", None, None),
+        ("", None, None),
+        ("# Grüße\nversion: 1.2.3\n", None, "1.2.3"),
+        ("x = 1\nVERSION = '2.0'\n", r"VERSION = '(.*)'", "2.0"),
+        ("x VERSION = '2.0'\n", r"VERSION = '(.*)'", None),
+        ("project(foo VERSION 3.1)\n", r"(?i)project\(\w+ version (\S+)\)",
+         "3.1"),
+        ("name: Grüße-4.0\n", r"name: Grüße-(.*)", "4.0"),
+        # unicode character classes and line breaks like codecs' readline()
+        ("name: é-1.0\n", r"name: (\w+)-", "é"),
+        ("v: \u0661\u0662\n", r"v: (\d+)", "\u0661\u0662"),
+        ("x\x0cVersion: 1.0\n", None, "1.0"),
+        ("x\rVersion: 1.0\n", None, "1.0"),
+        ("x\u2028Version: 1.0\n", None, "1.0"),
+        ("x\x85Version: 1.0\n", None, "1.0"),
+        ("x\nVersion = 5.0", r"Version = (\S+)\Z", "5.0"),
+        ("x\nVersion = 5.0\ny\n", r"Version = (\S+)\n", "5.0"),
+    )
+    @unpack
+    def test_versionfile(self, content, regex, expected_version):
+        self.assertEqual(self._detect(content, regex), expected_version)
+
+    def test_versionfile_invalid_utf8(self):
+        with open("VERSION", "wb") as f:
+            f.write(b"\xff\nVersion: 1.0\n")
+        vdetector = sv.VersionDetector(None, [], '', "VERSION")
+        self.assertRaises(UnicodeDecodeError,
+                          vdetector._get_version_via_versionfile)
+
+    @data(None, r"(?i)version: (.*)")
+    def test_versionfile_stops_at_first_match(self, regex):
+        # the invalid utf8 at the end is never read
+        with open("VERSION", "wb") as f:
+            f.write(b"Version: 1.0\n" + b"x" * (16 << 20) + b"\xff\n")
+        vdetector = sv.VersionDetector(regex, [], '', "VERSION")
+        self.assertEqual(vdetector._get_version_via_versionfile(), "1.0")
+
+    def _write_cpio(self, cpio_name, files):
+        """write a "new ascii" cpio archive with the given files"""
+        with open(cpio_name, "wb") as f:
+            for name, content in list(files.items()) + [("TRAILER!!!", b"")]:
+                name = name.encode('utf8') + b"\0"
+                fields = [0, 0o100644, 0, 0, 1, 0, len(content),
+                          0, 0, 0, 0, len(name), 0]
+                header = b"070701" + b"".join(b"%08X" % x for x in fields)
+                f.write(header + name + b"\0" * (-(110 + len(name)) % 4))
+                f.write(content + b"\0" * (-len(content) % 4))
+
+    @data(
+        ("testprog-1.0/VERSION", "testprog-1.0/VERSION"),
+        ("testprog-1.0/VERSION", "testprog-*/VERSION"),
+        ("./testprog-1.0/VERSION", "*/VERSION"),
+        ("VERSION", "VERSION"),
+    )
+    @unpack
+    def test_versionfile_in_tarball(self, tar_member, member):
+        with open("VERSION", "w") as f:
+            f.write("Version: 1.2.3\n")
+        with tarfile.open("testprog.tar.xz", "w:xz") as tf:
+            tf.add("VERSION", tar_member)
+        os.unlink("VERSION")
+        vdetector = sv.VersionDetector(None, [], '', "testprog.tar.xz:" +
+                                       member)
+        self.assertEqual(vdetector._get_version_via_versionfile(), "1.2.3")
+
+    def test_versionfile_in_zip(self):
+        with zipfile.ZipFile("testprog-1.0.zip", "w") as zf:
+            zf.writestr("testprog-1.0/setup.py", "version='0.0.1'\n")
+            zf.writestr("testprog-1.0/VERSION", "Version: 1.2.3\n")
+        vdetector = sv.VersionDetector(None, [], '',
+                                       "testprog-*.zip:*/VERSION")
+        self.assertEqual(vdetector._get_version_via_versionfile(), "1.2.3")
+
+    def test_versionfile_in_cpio(self):
+        self._write_cpio("testprog.obscpio", {
+            "testprog-1.0": b"",
+            "testprog-1.0/README": b"readme",
+            "testprog-1.0/VERSION": b"Version: 1.2.3\n"})
+        vdetector = sv.VersionDetector(None, [], '',
+                                       "testprog.obscpio:*/VERSION")
+        self.assertEqual(vdetector._get_version_via_versionfile(), "1.2.3")
+
+    def test_versionfile_missing_member(self):
+        self._write_tarfile("testprog.tar", ["testprog-1.0"], [])
+        vdetector = sv.VersionDetector(None, [], '',
+                                       "testprog.tar:*/VERSION")
+        self.assertRaises(OSError, vdetector._get_version_via_versionfile)
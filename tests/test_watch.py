@@ -0,0 +1,115 @@
+# Copyright (C) 2015 SUSE Linux GmbH
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301,USA.
+
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from test_base import SetVersionBaseTest
+from tests.loader import import_set_version
+
+
+sv = import_set_version()
+
+
+class DirectoryWatcherTest(SetVersionBaseTest):
+    """Test the incremental updates of the --watch mode"""
+
+    def setUp(self):
+        super(DirectoryWatcherTest, self).setUp()
+        self.outdir = tempfile.mkdtemp(
+            prefix='obs-service-set_version-test-outdir-')
+        self.args = {'regex': None, 'basename': 'testprog',
+                     'fromfile': None, 'version': None, 'file': None}
+
+    def tearDown(self):
+        shutil.rmtree(self.outdir)
+        super(DirectoryWatcherTest, self).tearDown()
+
+    def _write_spec(self, name, version):
+        with open(name, "w") as f:
+            f.write("Name: testprog\nVersion: %s\n" % version)
+
+    def _read_output(self, name):
+        with open(os.path.join(self.outdir, name)) as f:
+            return f.read()
+
+    def test_new_archive_rewrites_all_outputs(self):
+        self._write_spec("a.spec", "0")
+        self._write_spec("b.spec", "0")
+        self._write_tarfile("testprog-1.0.tar", ["testprog-1.0"], [])
+        watcher = sv.DirectoryWatcher(self.args, self.outdir)
+        watcher.update()
+        self.assertIn("Version: 1.0", self._read_output("b.spec"))
+
+        os.unlink("testprog-1.0.tar")
+        self._write_tarfile("testprog-2.0.tar", ["testprog-2.0"], [])
+        watcher.update(watcher.changes())
+        self.assertIn("Version: 2.0", self._read_output("a.spec"))
+        self.assertIn("Version: 2.0", self._read_output("b.spec"))
+
+    def test_spec_change_rewrites_only_that_spec(self):
+        self._write_spec("a.spec", "0")
+        self._write_spec("b.spec", "0")
+        self._write_tarfile("testprog-1.0.tar", ["testprog-1.0"], [])
+        watcher = sv.DirectoryWatcher(self.args, self.outdir)
+        watcher.update()
+        os.unlink(os.path.join(self.outdir, "b.spec"))
+        sample = 'set_version_strategy_hits_total{strategy="archive dirname"}'
+        hits = sv.metrics.samples[sample]
+
+        with open("a.spec", "a") as f:
+            f.write("Summary: changed\n")
+        watcher.update(watcher.changes())
+        self.assertIn("Summary: changed", self._read_output("a.spec"))
+        self.assertFalse(os.path.exists(os.path.join(self.outdir, "b.spec")))
+        # the archive was not looked at again, although the spec is now
+        # the newest file
+        self.assertEqual(watcher.vdetect.file_list[0], "a.spec")
+        self.assertEqual(sv.metrics.samples[sample], hits)
+
+    def test_versionfile_below_top_level(self):
+        self._write_spec("a.spec", "0")
+        os.mkdir("src")
+        with open("src/VERSION", "w") as f:
+            f.write("Version: 1.0\n")
+        watcher = sv.DirectoryWatcher(dict(self.args, fromfile="src/VERSION"),
+                                      self.outdir)
+        watcher.update()
+        self.assertIn("Version: 1.0", self._read_output("a.spec"))
+
+        with open("src/VERSION", "w") as f:
+            f.write("Version: 2.0\n")
+        self.assertEqual(watcher.changes(), set(["src/VERSION"]))
+        watcher.update(watcher.changes())
+        self.assertIn("Version: 2.0", self._read_output("a.spec"))
+
+    def test_failed_update_keeps_changes(self):
+        self._write_spec("a.spec", "0")
+        self._write_tarfile("testprog-1.0.tar", ["testprog-1.0"], [])
+        watcher = sv.DirectoryWatcher(self.args, self.outdir)
+        watcher.update()
+
+        self._write_tarfile("testprog-1.0.tar", ["testprog-2.0"], [])
+        with mock.patch.object(sv, "_write_build_descriptions",
+                               side_effect=OSError("disk full")):
+            self.assertFalse(watcher._safe_update(watcher.changes()))
+        self.assertEqual(watcher.changes(), set(["testprog-1.0.tar"]))
+        self.assertTrue(watcher._safe_update(watcher.changes()))
+        self.assertIn("Version: 2.0", self._read_output("a.spec"))
+        self.assertEqual(watcher.changes(), set())